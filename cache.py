@@ -1,6 +1,8 @@
+import json
 import os
 import sqlite3
 import threading
+import time
 
 _lock = threading.Lock()
 
@@ -14,6 +16,14 @@ with _lock, sqlite3.connect(DB_PATH) as conn:
             text     TEXT NOT NULL
         )
     ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tiles (
+            tile_key   TEXT PRIMARY KEY,
+            places     TEXT NOT NULL,
+            saturated  INTEGER NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+    ''')
 
 def get_cached_text(place_id: str) -> str | None:
     with _lock, sqlite3.connect(DB_PATH) as conn:
@@ -28,4 +38,22 @@ def set_cached_text(place_id: str, text: str) -> None:
         conn.execute(
             "INSERT OR REPLACE INTO cache (place_id, text) VALUES (?, ?)",
             (place_id, text)
-        )
\ No newline at end of file
+        )
+
+def get_cached_tile(tile_key: str, max_age: float) -> tuple[list, bool] | None:
+    """Places and saturation flag of a swept tile, if fetched within `max_age` s."""
+    with _lock, sqlite3.connect(DB_PATH) as conn:
+        row = conn.execute(
+            "SELECT places, saturated, fetched_at FROM tiles WHERE tile_key = ?",
+            (tile_key,)
+        ).fetchone()
+    if not row or time.time() - row[2] > max_age:
+        return None
+    return json.loads(row[0]), bool(row[1])
+
+def set_cached_tile(tile_key: str, places: list, saturated: bool) -> None:
+    with _lock, sqlite3.connect(DB_PATH) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO tiles (tile_key, places, saturated, fetched_at) VALUES (?, ?, ?, ?)",
+            (tile_key, json.dumps(places), int(saturated), time.time())
+        )
@@ -1,9 +1,14 @@
 
 import sqlite3
-from backend.scraper.places_api import find_restaurants
-from backend.scraper.scraper import fetch_website_text, detect_prix_fixe
-from backend.ai_assist.ai_analyze import ai_analyze_text
-from config.settings import DEFAULT_LOCATION, SEARCH_RADIUS_METERS
+from places_api import find_restaurants
+from scraper import iter_website_pages, find_prix_fixe_matches, extract_menu_details
+from ai_analyze import ai_analyze_text
+from settings import DEFAULT_LOCATION, SEARCH_RADIUS_METERS
+
+AI_FALLBACK_CHARS = 50_000  # text handed to the AI fallback, once per site
+
+# columns added to prix_fixe_menus after its first release
+MENU_COLUMNS = {"label": "TEXT", "courses": "INTEGER", "days": "TEXT", "times": "TEXT"}
 
 def ingest_and_scrape():
     print("Connecting to database...")
@@ -26,12 +31,20 @@ def ingest_and_scrape():
     CREATE TABLE IF NOT EXISTS prix_fixe_menus (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         restaurant_id INTEGER,
+        label TEXT,
         price REAL,
+        courses INTEGER,
+        days TEXT,
+        times TEXT,
         description TEXT,
         menu_link TEXT,
         FOREIGN KEY (restaurant_id) REFERENCES restaurants(id)
     )
     """)
+    existing = {row[1] for row in cursor.execute("PRAGMA table_info(prix_fixe_menus)")}
+    for col, col_type in MENU_COLUMNS.items():
+        if col not in existing:
+            cursor.execute(f"ALTER TABLE prix_fixe_menus ADD COLUMN {col} {col_type}")
 
     print("Fetching restaurant list...")
     results = find_restaurants(location=DEFAULT_LOCATION, radius=SEARCH_RADIUS_METERS)
@@ -51,17 +64,31 @@ def ingest_and_scrape():
             continue
 
         print(f"Scraping {website}...")
-        text = fetch_website_text(website)
-        found = detect_prix_fixe(text)
+        menus, head, head_len = [], [], 0
+        for page_url, page_text in iter_website_pages(website):
+            matches = find_prix_fixe_matches(page_text)
+            menus.extend(extract_menu_details(page_text, matches, page_url))
+            if head_len < AI_FALLBACK_CHARS:
+                head.append(page_text[:AI_FALLBACK_CHARS - head_len])
+                head_len += len(head[-1])
+        found = bool(menus)
 
         if not found:
-            result = ai_analyze_text(text)
+            result = ai_analyze_text("\n".join(head))
             found = result['has_prix_fixe']
 
         if found:
             cursor.execute("UPDATE restaurants SET has_prix_fixe = 1 WHERE id = ?", (restaurant_id,))
-            cursor.execute("INSERT INTO prix_fixe_menus (restaurant_id, price, description, menu_link) VALUES (?, ?, ?, ?)",
-                           (restaurant_id, 0.0, 'Prix fixe menu found (details TBD)', website))
+        for m in menus:
+            cursor.execute("""
+            INSERT INTO prix_fixe_menus
+            (restaurant_id, label, price, courses, days, times, description, menu_link)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (restaurant_id, m['label'], m['price'], m['courses'],
+                  m['days'], m['times'], m['excerpt'], m['menu_url']))
+        if found and not menus:
+            cursor.execute("INSERT INTO prix_fixe_menus (restaurant_id, description, menu_link) VALUES (?, ?, ?)",
+                           (restaurant_id, result['summary'], website))
 
         cursor.execute("UPDATE restaurants SET scraped = 1 WHERE id = ?", (restaurant_id,))
 
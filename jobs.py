@@ -0,0 +1,136 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+_lock = threading.Lock()
+
+# Absolute path so job state survives browser refreshes and new sessions
+DB_PATH = os.path.join(os.path.dirname(__file__), "jobs.db")
+ACTIVE = ("queued", "running")
+RETENTION_SECONDS = 7 * 24 * 60 * 60  # finished jobs older than this are dropped
+
+# Shared by every Streamlit session in this process
+_executor = ThreadPoolExecutor(max_workers=2)
+
+with _lock, sqlite3.connect(DB_PATH) as conn:
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id       TEXT PRIMARY KEY,
+            job_key      TEXT NOT NULL,
+            location     TEXT NOT NULL,
+            search_limit INTEGER,
+            status       TEXT NOT NULL,
+            done         INTEGER DEFAULT 0,
+            total        INTEGER DEFAULT 0,
+            error        TEXT,
+            cancel       INTEGER DEFAULT 0,
+            created      REAL,
+            updated      REAL
+        )
+    ''')
+    # a restart kills worker threads; don't let new searches attach to them
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error = 'interrupted by restart' "
+        "WHERE status IN (?, ?)",
+        ACTIVE,
+    )
+    conn.execute(
+        "DELETE FROM jobs WHERE status NOT IN (?, ?) AND updated < ?",
+        (*ACTIVE, time.time() - RETENTION_SECONDS),
+    )
+
+
+class Job:
+    """Handle passed to a job function for progress and cancellation."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def progress(self, done: int, total: int) -> None:
+        _update(self.job_id, done=done, total=total)
+
+    @property
+    def cancelled(self) -> bool:
+        job = get_job(self.job_id)
+        return bool(job and job["cancel"])
+
+
+def normalize_location(location: str) -> str:
+    """'  Islip ,NY ' → 'islip, ny' so equivalent searches share one job."""
+    loc = re.sub(r"\s*,\s*", ", ", location.strip().lower())
+    return " ".join(loc.split())
+
+
+def job_key(location: str, limit: int | None) -> str:
+    return f"{normalize_location(location)}|{limit or 'all'}"
+
+
+def submit(location: str, limit: int | None, fn) -> str:
+    """
+    Run `fn(job)` in the background and return its job id. If an identical
+    search (same normalized location and limit) is already queued or
+    running, return that job's id instead of starting another.
+    """
+    key = job_key(location, limit)
+    with _lock, sqlite3.connect(DB_PATH) as conn:
+        row = conn.execute(
+            "SELECT job_id FROM jobs WHERE job_key = ? AND status IN (?, ?)",
+            (key, *ACTIVE),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        job_id, now = uuid.uuid4().hex, time.time()
+        conn.execute(
+            "INSERT INTO jobs (job_id, job_key, location, search_limit, status, created, updated) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+            (job_id, key, normalize_location(location), limit, now, now),
+        )
+
+    _executor.submit(_run, job_id, fn)
+    return job_id
+
+
+def get_job(job_id: str) -> dict | None:
+    with _lock, sqlite3.connect(DB_PATH) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+
+def active_job(location: str) -> str | None:
+    """Id of the newest queued/running job for `location`, if any."""
+    with _lock, sqlite3.connect(DB_PATH) as conn:
+        row = conn.execute(
+            "SELECT job_id FROM jobs WHERE location = ? AND status IN (?, ?) "
+            "ORDER BY created DESC LIMIT 1",
+            (normalize_location(location), *ACTIVE),
+        ).fetchone()
+        return row[0] if row else None
+
+
+def cancel(job_id: str) -> None:
+    _update(job_id, cancel=1)
+
+
+def _update(job_id: str, **fields) -> None:
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    with _lock, sqlite3.connect(DB_PATH) as conn:
+        conn.execute(
+            f"UPDATE jobs SET {cols}, updated = ? WHERE job_id = ?",
+            (*fields.values(), time.time(), job_id),
+        )
+
+
+def _run(job_id: str, fn) -> None:
+    job = Job(job_id)
+    _update(job_id, status="running")
+    try:
+        fn(job)
+        _update(job_id, status="cancelled" if job.cancelled else "done")
+    except Exception as e:
+        _update(job_id, status="failed", error=str(e))
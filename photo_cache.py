@@ -0,0 +1,127 @@
+import base64
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+from settings import GOOGLE_API_KEY
+
+PHOTO_URL = "https://maps.googleapis.com/maps/api/place/photo"
+
+# Absolute path so thumbnails survive restarts
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "photo_cache")
+THUMB_SIZE = (400, 400)             # bounding box; aspect ratio is kept
+JPEG_QUALITY = 70
+MAX_CACHE_BYTES = 50 * 1024 * 1024  # oldest thumbnails evicted beyond this
+FAILURE_TTL = 6 * 60 * 60           # don't re-request a failed photo for 6 h
+
+_lock = threading.Lock()
+_ref_locks: dict[str, list] = {}    # photo_ref → [lock, number of users]
+_failed: dict[str, float] = {}      # photo_ref → time of last failed fetch
+
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+
+def thumbnail_path(photo_ref: str) -> str | None:
+    """
+    Local JPEG thumbnail for a Places `photo_ref`, downloading it from the
+    Photo API only the first time. Returns None if the photo can't be
+    fetched; such failures are remembered for `FAILURE_TTL` seconds.
+    """
+    path = os.path.join(CACHE_DIR, hashlib.sha1(photo_ref.encode()).hexdigest() + ".jpg")
+    with _lock:
+        if _recently_failed(photo_ref):
+            return None
+        entry = _ref_locks.setdefault(photo_ref, [threading.Lock(), 0])
+        entry[1] += 1
+
+    try:
+        with entry[0]:  # concurrent requests for one photo share a download
+            if os.path.exists(path):
+                os.utime(path)  # mark as recently used for eviction
+                return path
+            with _lock:
+                if _recently_failed(photo_ref):  # failed while we waited
+                    return None
+            if not _download(photo_ref, path):
+                with _lock:
+                    now = time.time()
+                    for ref in [r for r, t in _failed.items() if now - t >= FAILURE_TTL]:
+                        del _failed[ref]
+                    _failed[photo_ref] = now
+                return None
+    finally:
+        with _lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _ref_locks[photo_ref]
+
+    _evict()
+    return path
+
+
+def _recently_failed(photo_ref: str) -> bool:
+    """Caller must hold `_lock`."""
+    return time.time() - _failed.get(photo_ref, 0) < FAILURE_TTL
+
+
+def _download(photo_ref: str, path: str) -> bool:
+    """Fetch, shrink and atomically store one thumbnail."""
+    try:
+        r = requests.get(
+            PHOTO_URL,
+            params={"maxwidth": THUMB_SIZE[0], "photo_reference": photo_ref, "key": GOOGLE_API_KEY},
+            timeout=10,
+        )
+        r.raise_for_status()
+        img = Image.open(BytesIO(r.content)).convert("RGB")
+        img.thumbnail(THUMB_SIZE)
+        tmp = path + ".tmp"
+        img.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
+
+
+def thumbnail_data_uri(photo_ref: str) -> str | None:
+    """Thumbnail as a `data:` URI for inline `<img>` tags (no API key exposed)."""
+    path = thumbnail_path(photo_ref)
+    if not path:
+        return None
+    with open(path, "rb") as f:
+        return "data:image/jpeg;base64," + base64.b64encode(f.read()).decode("ascii")
+
+
+def prefetch_thumbnails(photo_refs, max_workers: int = 8) -> None:
+    """Warm the cache for several photos concurrently."""
+    refs = {r for r in photo_refs if r}
+    if refs:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            list(ex.map(thumbnail_path, refs))
+
+
+def _evict() -> None:
+    """Delete least recently used thumbnails until under MAX_CACHE_BYTES."""
+    with _lock:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith(".jpg"):
+                continue
+            st = os.stat(os.path.join(CACHE_DIR, name))
+            entries.append((st.st_mtime, st.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= MAX_CACHE_BYTES:
+                break
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+                total -= size
+            except OSError:
+                pass
@@ -1,20 +1,51 @@
 # places_api.py
+import logging
+import math
 import time
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 
 import requests
 from settings import GOOGLE_API_KEY
+from cache import get_cached_tile, set_cached_tile
 
 TEXT_URL   = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+NEARBY_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
 DETAIL_URL = "https://maps.googleapis.com/maps/api/place/details/json"
 
+# region sweep tuning
+RESULT_CAP        = 60                 # Nearby/Text Search never return more
+MIN_TILE_HALF_M   = 500                # stop subdividing below ~1 km tiles
+TILE_TTL_SECONDS  = 7 * 24 * 60 * 60   # swept tiles are reused for a week
+SWEEP_WORKERS     = 8
+REQUEST_RETRIES   = 3                  # per page, for quota / not‑ready token
+RETRY_DELAY_S     = 2                  # doubled after each retry
+_M_PER_DEG_LAT    = 111_320.0
+
+# every field the app needs, fetched in one Details call per place
+DETAIL_FIELDS = "name,vicinity,website,rating,photos,reviews,types"
+DETAILS_TTL_SECONDS = 3 * 60 * 60      # matches the app's text‑search cache TTL
+DETAILS_CACHE_SIZE  = 5_000            # places kept (least recently used out)
+
+log = logging.getLogger(__name__)
+
+
+class SweepError(RuntimeError):
+    """A region sweep hit an error that retrying or splitting cannot fix."""
+
+
+_details_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_details_lock = threading.Lock()
+
 
 # ────────────────── public helpers ───────────────────────────────────────────
 def text_search_restaurants(location_name: str) -> List[Dict]:
     """
     Google *Text Search* → returns a list of places that have a website.
     Each dict contains: place_id, name, vicinity, website, rating,
-                        photo_ref, types
+                        photo_ref, types, review
     """
     params = {"query": f"restaurants in {location_name}", "key": GOOGLE_API_KEY}
     seen, results = set(), []
@@ -29,23 +60,9 @@ def text_search_restaurants(location_name: str) -> List[Dict]:
             seen.add(pid)
 
             # need a Details call to get the website
-            det = _fetch_details(pid)
-            website = det.get("website")
-            if not website:                       # skip places without site
-                continue
-
-            photos = det.get("photos", [])
-            results.append(
-                {
-                    "place_id": pid,
-                    "name":     det.get("name", ""),
-                    "vicinity": det.get("vicinity", ""),
-                    "website":  website,
-                    "rating":   det.get("rating"),
-                    "photo_ref": photos[0]["photo_reference"] if photos else None,
-                    "types":    item.get("types", []),      # cuisine / venue tags
-                }
-            )
+            rec = _place_record(pid, item.get("types"))
+            if rec:                               # skip places without site
+                results.append(rec)
 
         nxt = data.get("next_page_token")
         if not nxt:
@@ -57,29 +74,206 @@ def text_search_restaurants(location_name: str) -> List[Dict]:
     return results
 
 
+def find_restaurants(location: str, radius: int) -> List[Dict]:
+    """
+    Region sweep → every restaurant with a website within `radius` metres of
+    `location` ("lat,lng"), in the same shape as `text_search_restaurants`.
+
+    A single query caps out at 60 results, so the area is covered by square
+    tiles queried concurrently with *Nearby Search*; any tile that comes back
+    full is split into four and re‑queried. Overlapping tiles are
+    deduplicated by `place_id`, and completed tiles are cached on disk.
+
+    Raises `SweepError` – and stops issuing requests – when the key is
+    rejected, a request is malformed, or the quota stays exhausted.
+    """
+    lat, lng = (float(v) for v in location.split(","))
+    found: Dict[str, Dict] = {}
+    failed = 0
+
+    ex = ThreadPoolExecutor(max_workers=SWEEP_WORKERS)
+    try:
+        tiles = [(lat, lng, float(radius))]
+        while tiles:
+            nxt = []
+            for tile, (places, saturated, complete) in zip(tiles, ex.map(_sweep_tile, tiles)):
+                for p in places:
+                    if _distance_m(lat, lng, p["lat"], p["lng"]) <= radius:
+                        found.setdefault(p["place_id"], p)
+                if not complete:
+                    failed += 1
+                if saturated and tile[2] / 2 >= MIN_TILE_HALF_M:
+                    nxt += [t for t in _split_tile(tile) if _tile_touches(t, lat, lng, radius)]
+            tiles = nxt
+
+        if failed:
+            log.warning(
+                "find_restaurants: %d tile(s) could not be fetched completely; "
+                "results for %s may be incomplete", failed, location,
+            )
+
+        records = ex.map(
+            lambda p: _place_record(p["place_id"], p["types"]), found.values()
+        )
+        return [r for r in records if r]
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
 def place_details(place_id: str) -> Dict:
     """
-    Lightweight Google *Place Details* wrapper.
-    Fetches only `reviews` and `types` – sufficient to build a promo snippet.
-    Costs one Places Details quota unit per call.
+    Google *Place Details* for `place_id`, including `reviews` and `types`.
+    Served from the per‑place cache filled by `text_search_restaurants`, so
+    a place that came from a search costs no extra quota here.
     """
-    fields = "reviews,types"
-    data = _get_json(
-        DETAIL_URL,
-        {"place_id": place_id, "fields": fields, "key": GOOGLE_API_KEY},
-    )
-    return data.get("result", {})
+    return _fetch_details(place_id)
 
 
 # ────────────────── internal helpers ─────────────────────────────────────────
 def _fetch_details(pid: str) -> Dict:
-    """Details call used internally by the Text‑Search routine."""
-    fields = "name,vicinity,website,rating,photos"
+    """
+    One Details call per `place_id`; successful results are cached for
+    `DETAILS_TTL_SECONDS`, keeping at most `DETAILS_CACHE_SIZE` places.
+    """
+    with _details_lock:
+        hit = _details_cache.get(pid)
+        if hit and time.time() - hit[0] < DETAILS_TTL_SECONDS:
+            _details_cache.move_to_end(pid)
+            return hit[1]
     data = _get_json(
         DETAIL_URL,
-        {"place_id": pid, "fields": fields, "key": GOOGLE_API_KEY},
+        {"place_id": pid, "fields": DETAIL_FIELDS, "key": GOOGLE_API_KEY},
     )
-    return data.get("result", {})
+    result = data.get("result", {})
+    if result:
+        with _details_lock:
+            _details_cache[pid] = (time.time(), result)
+            _details_cache.move_to_end(pid)
+            while len(_details_cache) > DETAILS_CACHE_SIZE:
+                _details_cache.popitem(last=False)
+    return result
+
+
+def _place_record(pid: str, types: List[str] | None = None) -> Dict | None:
+    """Result dict for one place, or None when it has no website."""
+    det = _fetch_details(pid)
+    website = det.get("website")
+    if not website:
+        return None
+
+    photos = det.get("photos", [])
+    reviews = det.get("reviews") or [{}]
+    return {
+        "place_id": pid,
+        "name":     det.get("name", ""),
+        "vicinity": det.get("vicinity", ""),
+        "website":  website,
+        "rating":   det.get("rating"),
+        "photo_ref": photos[0]["photo_reference"] if photos else None,
+        "types":    types or det.get("types", []),      # cuisine / venue tags
+        "review":   reviews[0].get("text", ""),
+    }
+
+
+def _sweep_tile(tile: Tuple[float, float, float]) -> Tuple[List[Dict], bool, bool]:
+    """
+    All Nearby Search pages for the circle enclosing a square tile
+    `(lat, lng, half_side_m)`. Returns `(places, saturated, complete)`; a
+    tile is saturated when it hit the 60‑result cap and may hide more
+    places, and incomplete when a page kept failing transiently.
+    """
+    lat, lng, half = tile
+    key = f"{lat:.5f},{lng:.5f},{half:.0f}"
+    cached = get_cached_tile(key, TILE_TTL_SECONDS)
+    if cached:
+        return (*cached, True)
+
+    params = {
+        "location": f"{lat},{lng}",
+        "radius":   int(math.ceil(half * math.sqrt(2))),
+        "type":     "restaurant",
+        "key":      GOOGLE_API_KEY,
+    }
+    places, complete = [], True
+    while True:
+        data = _get_page(params)
+        if data is None:
+            complete = False
+            break
+        for item in data.get("results", []):
+            loc = item.get("geometry", {}).get("location", {})
+            if item.get("place_id") and "lat" in loc:
+                places.append(
+                    {
+                        "place_id": item["place_id"],
+                        "lat":      loc["lat"],
+                        "lng":      loc["lng"],
+                        "types":    item.get("types", []),
+                    }
+                )
+        nxt = data.get("next_page_token")
+        if not nxt:
+            break
+        time.sleep(2)
+        params = {"pagetoken": nxt, "key": GOOGLE_API_KEY}
+
+    saturated = len(places) >= RESULT_CAP
+    if complete:
+        set_cached_tile(key, places, saturated)
+    return places, saturated, complete
+
+
+def _get_page(params: Dict) -> Dict | None:
+    """
+    One Nearby Search page. Transient failures (network errors,
+    UNKNOWN_ERROR, next‑page tokens that are not valid yet) and
+    OVER_QUERY_LIMIT are retried with back‑off; None if a transient failure
+    persists. Raises `SweepError` on REQUEST_DENIED, on any other
+    INVALID_REQUEST, and when the quota is still exhausted after retries.
+    """
+    delay = RETRY_DELAY_S
+    for attempt in range(REQUEST_RETRIES + 1):
+        data = _get_json(NEARBY_URL, params)
+        status = data.get("status")
+        if status in ("OK", "ZERO_RESULTS"):
+            return data
+
+        transient = status in ("UNKNOWN_ERROR", None) or (
+            status == "INVALID_REQUEST" and "pagetoken" in params
+        )
+        if not (transient or status == "OVER_QUERY_LIMIT") or attempt == REQUEST_RETRIES:
+            if transient:
+                return None
+            raise SweepError(f"Nearby Search failed: {status} {data.get('error_message', '')}".strip())
+        time.sleep(delay)
+        delay *= 2
+    return None
+
+
+def _split_tile(tile: Tuple[float, float, float]) -> List[Tuple[float, float, float]]:
+    """Four quadrant tiles of a square tile."""
+    lat, lng, half = tile
+    q = half / 2
+    dlat = q / _M_PER_DEG_LAT
+    dlng = q / (_M_PER_DEG_LAT * math.cos(math.radians(lat)))
+    return [
+        (lat + sy * dlat, lng + sx * dlng, q)
+        for sy in (-1, 1) for sx in (-1, 1)
+    ]
+
+
+def _tile_touches(tile: Tuple[float, float, float], lat: float, lng: float, radius: float) -> bool:
+    """Whether a tile can contain any point of the search circle."""
+    t_lat, t_lng, half = tile
+    return _distance_m(lat, lng, t_lat, t_lng) <= radius + half * math.sqrt(2)
+
+
+def _distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great‑circle distance in metres."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6_371_000 * math.asin(math.sqrt(a))
 
 
 def _get_json(url: str, params: Dict) -> Dict:
@@ -1,8 +1,8 @@
-import re, requests, hashlib
-from urllib.parse import urljoin, urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re, json, requests, hashlib, threading
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from io import BytesIO
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Optional, Iterator
 
 from bs4 import BeautifulSoup
 from PIL import Image
@@ -28,8 +28,51 @@ PATTERNS = {
     "deals":          r"\bdeals?\b",
 }
 
+# ─────────────── Menu detail patterns ──────────────────────
+WINDOW_CHARS = 300          # chars inspected either side of a keyword hit
+MAX_HITS_PER_LABEL = 3      # cap repeated hits (e.g. "deals") per label
+CLUSTER_GAP = 40            # hits closer than this describe the same deal
+
+_NUM_WORDS = {
+    "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_DAY = (
+    r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?"
+    r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)s?\b\.?"
+)
+_TIME  = r"\d{1,2}(?::\d{2})?\s*(?:am|pm|a\.m\.|p\.m\.)?"
+_CLOCK = r"\d{1,2}(?::\d{2})?\s*(?:am|pm|a\.m\.|p\.m\.)"
+
+PRICE_RE   = re.compile(r"\$\s?(\d{1,3}(?:,\d{3})+|\d+)(?:[.,](\d{2})\b)?")
+COURSES_RE = re.compile(
+    r"\b(\d{1,2}|" + "|".join(_NUM_WORDS) + r")[\s\-]*courses?\b", re.IGNORECASE
+)
+DAYS_RE = re.compile(
+    rf"\b(?:{_DAY}\s*(?:-|–|to|through|thru)\s*{_DAY}|daily|every\s+day|{_DAY}(?:\s*(?:,|&|and)\s*{_DAY})*)",
+    re.IGNORECASE,
+)
+BREAK_RE = re.compile(r"[.!?;]\s|\n|\s[|•·]\s")
+TIMES_RE = re.compile(
+    rf"\b{_TIME}\s*(?:-|–|to|until|till)\s*{_CLOCK}|\b(?:until|till|before|after)\s+{_CLOCK}|\ball\s+day\b",
+    re.IGNORECASE,
+)
+
 HEADERS = {"User-Agent": "Mozilla/5.0"}
-url_cache: dict[str, str] = {}
+
+# ─────────────── Memory bounds ────────────────────────────
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024   # per downloaded page / PDF / image
+MAX_SITE_BYTES     = 8 * 1024 * 1024   # per crawled site, all pages combined
+MAX_EXCERPT_CHARS  = 20_000            # relevant text kept per site
+FETCH_WINDOW       = 10                # subpage downloads in flight at once
+CHUNK_BYTES        = 64 * 1024
+
+# ─────────────── Structured‑data fast path ────────────────
+MAX_FAST_PATH_URLS = 5                 # declared menu resources fetched
+MAX_CHILD_SITEMAPS = 3                 # sitemap index entries followed
+LOC_RE = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "yclid", "mc_cid", "mc_eid", "ref"}
 
 # ─────────────── Utility converters ───────────────────────
 def _pdf_bytes_to_text(data: bytes) -> str:
@@ -46,104 +89,480 @@ def _image_bytes_to_text(data: bytes) -> str:
     except Exception:
         return ""
 
-def _extract_text(resp, src_url) -> str:
-    ctype = resp.headers.get("content-type", "").lower()
-    if "pdf" in ctype or src_url.lower().endswith(".pdf"):
-        return _pdf_bytes_to_text(resp.content)
-    elif "image" in ctype or src_url.lower().endswith((".jpg", ".jpeg", ".png")):
-        return _image_bytes_to_text(resp.content)
+def _is_pdf(ctype: str, src_url: str) -> bool:
+    return "pdf" in ctype or src_url.lower().endswith(".pdf")
+
+def _is_image(ctype: str, src_url: str) -> bool:
+    return "image" in ctype or src_url.lower().endswith((".jpg", ".jpeg", ".png"))
+
+def _extract_text(ctype: str, data: bytes, encoding: str, src_url: str) -> str:
+    if _is_pdf(ctype, src_url):
+        return _pdf_bytes_to_text(data)
+    elif _is_image(ctype, src_url):
+        return _image_bytes_to_text(data)
     else:
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(data.decode(encoding, "ignore"), "html.parser")
         return " ".join(
             tag.get_text(" ", strip=True).lower()
             for tag in soup.find_all(["h1", "h2", "h3", "p", "li", "div"])
         )
 
-def _safe_fetch(url: str) -> str:
-    if url in url_cache:
-        return url_cache[url]
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=10)
+class _ByteBudget:
+    """Thread‑safe byte allowance shared by every download of one site."""
+
+    def __init__(self, limit: int):
+        self.left = limit
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> int:
+        with self._lock:
+            n = max(0, min(n, self.left))
+            self.left -= n
+            return n
+
+def _stream_get(url: str, budget: _ByteBudget) -> Optional[Tuple[str, bytes, str]]:
+    """
+    Stream `url` in chunks, stopping at `MAX_RESPONSE_BYTES` or when the site
+    budget runs out. Returns `(content_type, body, encoding)`, or None when
+    the request fails or a PDF / image would be truncated (partial binaries
+    cannot be parsed).
+    """
+    if budget.left <= 0:
+        return None
+    with requests.get(url, headers=HEADERS, timeout=10, stream=True) as r:
         r.raise_for_status()
-        txt = _extract_text(r, url)
-        url_cache[url] = txt
-        return txt
+        ctype = r.headers.get("content-type", "").lower()
+        binary = _is_pdf(ctype, url) or _is_image(ctype, url)
+        declared = int(r.headers.get("content-length") or 0)
+        if binary and declared > min(MAX_RESPONSE_BYTES, budget.left):
+            return None
+
+        buf, size = bytearray(), 0
+        for chunk in r.iter_content(CHUNK_BYTES):
+            allowed = budget.take(min(len(chunk), MAX_RESPONSE_BYTES - size))
+            buf += chunk[:allowed]
+            size += allowed
+            if allowed < len(chunk):
+                if binary:
+                    return None
+                break
+        return ctype, bytes(buf), r.encoding or "utf-8"
+
+def _safe_fetch(url: str, budget: _ByteBudget) -> str:
+    try:
+        got = _stream_get(url, budget)
+        return _extract_text(got[0], got[1], got[2], url) if got else ""
     except Exception:
-        url_cache[url] = ""
         return ""
 
+def _fetch_pages(ex, links: List[str], budget: _ByteBudget) -> Iterator[Tuple[str, str]]:
+    """
+    Fetch `links` on `ex` with at most `FETCH_WINDOW` downloads in flight and
+    yield `(link, text)` as each finishes; a result is dropped once yielded.
+    """
+    queue, pending = iter(links), {}
+    while True:
+        for link in queue:
+            pending[ex.submit(_safe_fetch, link, budget)] = link
+            if len(pending) >= FETCH_WINDOW:
+                break
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            yield pending.pop(fut), fut.result()
+        del done
+
+def _ld_types(obj: dict) -> set:
+    t = obj.get("@type", [])
+    return {x.lower() for x in ([t] if isinstance(t, str) else t) if isinstance(x, str)}
+
+def _ld_objects(data) -> Iterator[dict]:
+    """Every JSON‑LD object in `data`, walking lists, @graph and nested values."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _ld_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (list, dict)):
+                yield from _ld_objects(value)
+
+def _ld_menu_text(obj: dict) -> str:
+    """Names, descriptions and prices of a schema.org Menu / section / item."""
+    parts = []
+    for o in _ld_objects(obj):
+        for key in ("name", "description"):
+            if isinstance(o.get(key), str):
+                parts.append(o[key])
+        offers = o.get("offers")
+        for offer in (offers if isinstance(offers, list) else [offers]):
+            if isinstance(offer, dict) and offer.get("price") not in (None, ""):
+                parts.append(f"${offer['price']}")
+    return " ".join(parts).lower()
+
+def _structured_menus(soup, base_url: str) -> Tuple[List[str], List[str]]:
+    """
+    Read schema.org JSON‑LD blocks on the page. Returns the text of inline
+    `Menu` objects and the menu URLs declared via `hasMenu` / `menu` on any
+    object (Restaurant, BarOrPub, CafeOrCoffeeShop, LocalBusiness, …).
+    """
+    texts, urls = [], []
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string or "")
+        except ValueError:
+            continue
+        for obj in _ld_objects(data):
+            if "menu" in _ld_types(obj):
+                texts.append(_ld_menu_text(obj))
+            for key in ("hasMenu", "menu"):
+                decl = obj.get(key)
+                for d in (decl if isinstance(decl, list) else [decl]):
+                    ref = d.get("url") or d.get("@id") if isinstance(d, dict) else d
+                    if isinstance(ref, str) and ref and not ref.startswith("#"):
+                        urls.append(urljoin(base_url, ref))
+    return [t for t in texts if t], list(dict.fromkeys(urls))
+
+def _sitemap_menu_urls(base_url: str, budget: "_ByteBudget") -> List[str]:
+    """Same‑site `/menu`‑like pages listed in sitemap.xml (one index level deep)."""
+    base_host = _site_host(base_url)
+    queue, found = [urljoin(base_url, "/sitemap.xml")], []
+    fetched = 0
+    while queue and fetched <= MAX_CHILD_SITEMAPS:
+        sm = queue.pop(0)
+        fetched += 1
+        try:
+            got = _stream_get(sm, budget)
+        except Exception:
+            continue
+        if not got:
+            continue
+        for loc in LOC_RE.findall(got[1].decode(got[2], "ignore")):
+            if _site_host(loc) != base_host:
+                continue
+            path = urlparse(loc).path.lower()
+            if path.endswith(".xml"):
+                queue.append(loc)
+            elif "menu" in path:
+                found.append(loc)
+    return list(dict.fromkeys(found))
+
 def _hash(text: str) -> str:
     return hashlib.md5(text.encode("utf-8")).hexdigest()
 
+def _site_host(url: str) -> str:
+    """Lower‑cased host of `url` without credentials, `www.` or default port."""
+    host = urlparse(url if "//" in url else f"//{url}").netloc.lower().split("@")[-1]
+    if host.startswith("www."):
+        host = host[4:]
+    return host.removesuffix(":80").removesuffix(":443")
+
+def normalize_site(url: str) -> str:
+    """
+    Key that identifies a website regardless of scheme, `www.`, trailing
+    slash, fragment or tracking parameters (utm_*, fbclid, gclid, …).
+    """
+    parts = urlparse(url if "//" in url else f"//{url}")
+    host = _site_host(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    key = host + parts.path.rstrip("/")
+    return f"{key}?{urlencode(query)}" if query else key
+
 # ─────────────── Main scraper routine ──────────────────────
-def fetch_website_text(url: str, *, dedupe: bool = False) -> str:
+def iter_website_pages(url: str) -> Iterator[Tuple[str, str]]:
     """
     Crawl `url`, pull down HTML, PDFs, and first few images linked on the same
-    domain, then aggregate their visible text. When `dedupe=True`, identical
-    lines are collapsed to limit size before returning.
+    domain, and yield `(page_url, text)` for every page with non‑empty,
+    previously unseen text as soon as it arrives. Downloads are streamed and
+    capped per response and per site, and at most `FETCH_WINDOW` subpage
+    texts are held at any one time.
+
+    Menus the site declares itself (schema.org JSON‑LD `Menu` / `hasMenu`,
+    or `/menu` pages in sitemap.xml) are read first; when one of them
+    matches a keyword pattern the generic link crawl is skipped.
     """
-    visited, seen_hashes, collected = set(), set(), []
+    budget = _ByteBudget(MAX_SITE_BYTES)
+    visited, seen_hashes = set(), set()
 
     try:
-        base_resp = requests.get(url, headers=HEADERS, timeout=10)
-        base_resp.raise_for_status()
+        base = _stream_get(url, budget)
     except Exception:
-        return ""
+        return
+    if not base:
+        return
+    ctype, body, encoding = base
 
-    base_text = _extract_text(base_resp, url)
-    h = _hash(base_text)
-    if base_text and h not in seen_hashes:
-        collected.append(base_text)
-        seen_hashes.add(h)
+    base_text = _extract_text(ctype, body, encoding, url)
+    if base_text:
+        seen_hashes.add(_hash(base_text))
+        yield url, base_text
+    if _is_pdf(ctype, url) or _is_image(ctype, url):
+        return
 
-    soup = BeautifulSoup(base_resp.text, "html.parser")
+    soup = BeautifulSoup(body.decode(encoding, "ignore"), "html.parser")
+    del body, base_text
     base_domain = urlparse(url).netloc
 
-    html_links, media_links = [], []
-    for tag in soup.find_all(["a", "img"]):
-        attr = "href" if tag.name == "a" else "src"
-        if not tag.has_attr(attr):
-            continue
-        link = urljoin(url, tag[attr])
-        if urlparse(link).netloc != base_domain or link in visited:
-            continue
-        visited.add(link)
-        if link.lower().endswith((".pdf", ".jpg", ".jpeg", ".png")):
-            media_links.append(link)
-        elif tag.name == "a":
-            html_links.append(link)
-
-    link_queue = media_links[:5] + html_links  # small breadth‑first slice
-
-    with ThreadPoolExecutor(max_workers=10) as ex:
-        futures = {ex.submit(_safe_fetch, link): link for link in link_queue}
-        for fut in as_completed(futures):
-            sub_text = fut.result()
+    ex = ThreadPoolExecutor(max_workers=10)
+    try:
+        # fast path: menus declared in JSON‑LD, else listed in sitemap.xml
+        try:
+            ld_texts, menu_urls = _structured_menus(soup, url)
+        except Exception:       # malformed markup → plain crawl below
+            ld_texts, menu_urls = [], []
+        answered = False
+        for ld_text in ld_texts:
+            h = _hash(ld_text)
+            if h not in seen_hashes:
+                seen_hashes.add(h)
+                answered = answered or detect_prix_fixe_detailed(ld_text)[0]
+                yield f"{url}#menu", ld_text
+
+        if not menu_urls and not answered:
+            try:
+                menu_urls = _sitemap_menu_urls(url, budget)
+            except Exception:
+                menu_urls = []
+        menu_urls = [u for u in menu_urls if u != url][:MAX_FAST_PATH_URLS]
+        visited.update(menu_urls)
+        for link, sub_text in _fetch_pages(ex, menu_urls, budget):
             h = _hash(sub_text)
             if sub_text and h not in seen_hashes:
-                collected.append(sub_text)
                 seen_hashes.add(h)
+                answered = answered or detect_prix_fixe_detailed(sub_text)[0]
+                yield link, sub_text
+        if answered:            # declared menu settled it – skip the crawl
+            return
 
-    combined = "\n".join(collected).strip()
-    if not dedupe:
-        return combined
+        html_links, media_links = [], []
+        for tag in soup.find_all(["a", "img"]):
+            attr = "href" if tag.name == "a" else "src"
+            if not tag.has_attr(attr):
+                continue
+            link = urljoin(url, tag[attr])
+            if urlparse(link).netloc != base_domain or link in visited:
+                continue
+            visited.add(link)
+            if link.lower().endswith((".pdf", ".jpg", ".jpeg", ".png")):
+                media_links.append(link)
+            elif tag.name == "a":
+                html_links.append(link)
+        del soup
 
-    # simple intra‑page deduplication
-    lines: List[str] = [
-        ln.strip() for ln in combined.splitlines() if ln.strip()
-    ]
+        link_queue = media_links[:5] + html_links  # small breadth‑first slice
+
+        for link, sub_text in _fetch_pages(ex, link_queue, budget):
+            h = _hash(sub_text)
+            if sub_text and h not in seen_hashes:
+                seen_hashes.add(h)
+                yield link, sub_text
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+def _dedupe_lines(text: str) -> str:
+    """Collapse repeated lines (case‑insensitive), keeping first occurrences."""
     uniq, seen_lines = [], set()
-    for ln in lines:
+    for ln in text.splitlines():
+        ln = ln.strip()
         sig = ln.lower()
-        if sig in seen_lines:
+        if not ln or sig in seen_lines:
             continue
         seen_lines.add(sig)
         uniq.append(ln)
     return "\n".join(uniq)
 
+def fetch_website_text(url: str, *, dedupe: bool = False) -> str:
+    """
+    Aggregate the visible text of every crawled page. When `dedupe=True`,
+    identical lines are collapsed to limit size before returning.
+    """
+    combined = "\n".join(text for _, text in iter_website_pages(url)).strip()
+    return _dedupe_lines(combined) if dedupe else combined
+
+def relevant_excerpts(
+    text: str, matches: List[Tuple[str, int, int]], window: int = WINDOW_CHARS
+) -> List[str]:
+    """Slices of `text` within `window` chars of a hit, overlaps merged."""
+    spans: List[List[int]] = []
+    for _, start, end in matches:
+        lo, hi = max(0, start - window), min(len(text), end + window)
+        if spans and lo <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], hi)
+        else:
+            spans.append([lo, hi])
+    return [text[lo:hi].strip() for lo, hi in spans]
+
+def _scan_pages(url: str, dedupe: bool) -> Tuple[str, bool, str]:
+    """
+    Run detection page by page and keep only the excerpts around hits. The
+    label is the highest‑priority `PATTERNS` entry seen on any page.
+    """
+    order = list(PATTERNS)
+    best, kept, size = None, [], 0
+    for _, text in iter_website_pages(url):
+        hits = find_prix_fixe_matches(text)
+        if not hits:
+            continue
+        rank = min(order.index(label) for label, _, _ in hits)
+        best = rank if best is None else min(best, rank)
+        for chunk in relevant_excerpts(text, hits):
+            if size >= MAX_EXCERPT_CHARS:
+                break
+            chunk = chunk[: MAX_EXCERPT_CHARS - size]
+            kept.append(chunk)
+            size += len(chunk)
+
+    excerpt = "\n".join(kept)
+    if dedupe:
+        excerpt = _dedupe_lines(excerpt)
+    return excerpt, best is not None, order[best] if best is not None else ""
+
+def scan_website(url: str, *, dedupe: bool = False, cache: dict | None = None) -> Tuple[str, bool, str]:
+    """
+    Crawl `url` and run detection on it, returning `(text, matched, label)`
+    where `text` holds only the excerpts around keyword hits.
+
+    `cache` is a dict owned by one search run, mapping (normalized site,
+    dedupe) → Future. With it, each site is crawled at most once per run and
+    callers that arrive mid‑crawl wait for and share the in‑flight result.
+    """
+    if cache is None:
+        return _scan_pages(url, dedupe)
+
+    fresh = Future()
+    fut = cache.setdefault((normalize_site(url), dedupe), fresh)  # atomic
+    if fut is fresh:
+        try:
+            fut.set_result(_scan_pages(url, dedupe))
+        except Exception as e:
+            fut.set_exception(e)
+    return fut.result()
+
 # ─────────────── Pattern detection (single place) ─────────
 def detect_prix_fixe_detailed(text: str) -> Tuple[bool, str]:
     for label, pattern in PATTERNS.items():
         if re.search(pattern, text, re.IGNORECASE):
             return True, label
-    return False, ""
\ No newline at end of file
+    return False, ""
+
+def find_prix_fixe_matches(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Every keyword hit in `text` as `(label, start, end)`, ordered by offset.
+    At most `MAX_HITS_PER_LABEL` hits are kept per label.
+    """
+    hits = []
+    for label, pattern in PATTERNS.items():
+        for i, m in enumerate(re.finditer(pattern, text, re.IGNORECASE)):
+            if i >= MAX_HITS_PER_LABEL:
+                break
+            if m.end() > m.start():
+                hits.append((label, m.start(), m.end()))
+    return sorted(hits, key=lambda h: h[1])
+
+# ─────────────── Windowed menu extraction ─────────────────
+def _nearest(regex, window: str, lo: int, hi: int) -> Optional[re.Match]:
+    """Match of `regex` in `window` closest to the hit spanning `lo:hi`."""
+    best, best_dist = None, None
+    for m in regex.finditer(window):
+        if m.start() >= hi:
+            dist = m.start() - hi
+        elif m.end() <= lo:
+            dist = lo - m.end()
+        else:
+            dist = 0
+        if best_dist is None or dist < best_dist:
+            best, best_dist = m, dist
+    return best
+
+def _parse_price(m: re.Match) -> float:
+    """'$1,200' → 1200.0, '$19.95' / '$19,95' → 19.95."""
+    whole, cents = m.group(1).replace(",", ""), m.group(2)
+    return float(f"{whole}.{cents}" if cents else whole)
+
+def _cluster_bounds(
+    text: str, matches: List[Tuple[str, int, int]]
+) -> List[Tuple[int, int]]:
+    """
+    Per hit, the `(lo, hi)` range it may draw details from. Hits within
+    `CLUSTER_GAP` chars of each other and in the same sentence share a
+    range; the gap between two
+    clusters is split at its last sentence break (or at the later cluster).
+    """
+    clusters: List[List[int]] = []          # [start, end]
+    owner = []
+    for _, start, end in matches:
+        if (
+            clusters
+            and start - clusters[-1][1] <= CLUSTER_GAP
+            and not BREAK_RE.search(text, clusters[-1][1], start)
+        ):
+            clusters[-1][1] = max(clusters[-1][1], end)
+        else:
+            clusters.append([start, end])
+        owner.append(len(clusters) - 1)
+
+    cuts = []
+    for (_, prev_end), (next_start, _) in zip(clusters, clusters[1:]):
+        breaks = list(BREAK_RE.finditer(text, prev_end, next_start))
+        cuts.append(breaks[-1].end() if breaks else next_start)
+
+    return [
+        (cuts[i - 1] if i > 0 else 0, cuts[i] if i < len(cuts) else len(text))
+        for i in owner
+    ]
+
+def _parse_courses(raw: str) -> Optional[int]:
+    raw = raw.lower()
+    return int(raw) if raw.isdigit() else _NUM_WORDS.get(raw)
+
+def extract_menu_details(
+    text: str,
+    matches: List[Tuple[str, int, int]],
+    source_url: str = "",
+    window: int = WINDOW_CHARS,
+) -> List[Dict]:
+    """
+    Parse only a `window`‑sized slice of `text` around each detection hit and
+    pull out price, number of courses, days, times and an excerpt. A window
+    never reaches past the midpoint to a neighbouring, unrelated hit. Hits
+    whose windows yield identical details are collapsed into one row.
+    """
+    matches = sorted(matches, key=lambda h: h[1])
+    rows, seen = [], set()
+    for (label, start, end), (c_lo, c_hi) in zip(matches, _cluster_bounds(text, matches)):
+        lo, hi = max(c_lo, start - window), min(c_hi, end + window)
+        chunk = text[lo:hi]
+        span = (start - lo, end - lo)
+
+        price_m   = _nearest(PRICE_RE, chunk, *span)
+        courses_m = _nearest(COURSES_RE, chunk, *span)
+        days_m    = _nearest(DAYS_RE, chunk, *span)
+        times_m   = _nearest(TIMES_RE, chunk, *span)
+
+        price   = _parse_price(price_m) if price_m else None
+        courses = _parse_courses(courses_m.group(1)) if courses_m else None
+        days    = days_m.group(0).strip() if days_m else ""
+        times   = times_m.group(0).strip() if times_m else ""
+
+        key = (price, courses, days, times)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        excerpt = re.sub(r"\s+", " ", text[max(0, start - 80): end + 80]).strip()
+        rows.append(
+            {
+                "label":    label,
+                "price":    price,
+                "courses":  courses,
+                "days":     days,
+                "times":    times,
+                "menu_url": source_url,
+                "excerpt":  excerpt,
+            }
+        )
+    return rows
@@ -1,6 +1,6 @@
 # ───────────────────────── Imports ──────────────────────────
-import os, re, json, time, logging, sqlite3
-from concurrent.futures import ThreadPoolExecutor
+import os, re, json, time, zlib, logging, sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import streamlit as st
 from streamlit_lottie import st_lottie
@@ -12,18 +12,26 @@ st.set_page_config("The Fixe", "🍽", layout="wide")
 import gspread
 from google.oauth2.service_account import Credentials
 
-from scraper import fetch_website_text, detect_prix_fixe_detailed
-from settings import GOOGLE_API_KEY
+from scraper import (
+    scan_website,
+    find_prix_fixe_matches, extract_menu_details,
+)
+from photo_cache import thumbnail_data_uri, prefetch_thumbnails
+import jobs
 from places_api import text_search_restaurants, place_details
 
 # ─────────────────── Google Sheets setup ───────────────────
 scope = ["https://www.googleapis.com/auth/spreadsheets"]
-credentials = Credentials.from_service_account_info(
-    st.secrets["gcp_service_account"], scopes=scope
-)
-client = gspread.authorize(credentials)
 SHEET_ID = "1mZymnpQ1l-lEqiwDnursBKN0Mh69L5GziXFyyM5nUI0"
-sheet = client.open_by_key(SHEET_ID).sheet1
+
+@st.cache_resource(show_spinner=False)
+def get_sheet():
+    """Opened lazily so page loads served from a snapshot never touch Google."""
+    credentials = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"], scopes=scope
+    )
+    client = gspread.authorize(credentials)
+    return client.open_by_key(SHEET_ID).sheet1
 
 # ─────────────────── Streamlit page title ──────────────────
 st.title("The Fixe")
@@ -76,15 +84,32 @@ def nice_types(tp):
         }
     ][:3]
 
-def first_review(pid):
-    return re.sub(
-        r"\s+", " ",
-        (place_details(pid).get("reviews") or [{}])[0].get("text", "")
-    ).strip()[:100] + "…"
+def first_review(place):
+    text = place.get("review")
+    if text is None:  # place did not come from text_search_restaurants
+        text = (place_details(place["place_id"]).get("reviews") or [{}])[0].get("text", "")
+    return re.sub(r"\s+", " ", text).strip()[:100] + "…"
 
 def review_link(pid):
     return f"https://search.google.com/local/reviews?placeid={pid}"
 
+def deal_summary(menus, lbl):
+    """
+    One‑line '$45 · 3 courses · tue-thu · 5pm-7pm' from extracted menu rows,
+    preferring rows for the card's own label `lbl`.
+    """
+    menus = [m for m in menus if m["label"] == lbl] or menus
+    if not menus:
+        return ""
+    best = max(menus, key=lambda m: (m["price"] is not None, m["courses"] is not None))
+    parts = []
+    if best["price"] is not None:
+        parts.append(f"${best['price']:g}")
+    if best["courses"]:
+        parts.append(f"{best['courses']} courses")
+    parts += [p for p in (best["days"], best["times"]) if p]
+    return " · ".join(parts)
+
 # ─────────────────── SQLite persistence ────────────────────
 APP_DIR = os.path.dirname(__file__)
 DB_FILE = os.path.join(APP_DIR, "prix_fixe.db")
@@ -99,20 +124,32 @@ CREATE TABLE restaurants (
   review_link TEXT,
   types TEXT,
   location TEXT, rating REAL, photo_ref TEXT,
+  deal_info TEXT,
   UNIQUE(name, address, location)
 );
 """
 
+SNAPSHOT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+  location TEXT PRIMARY KEY,
+  data BLOB,
+  built REAL
+);
+"""
+
 def init_db():
     with sqlite3.connect(DB_FILE) as c:
-        c.executescript("DROP TABLE IF EXISTS restaurants;" + SCHEMA)
+        c.executescript(
+            "DROP TABLE IF EXISTS restaurants; DROP TABLE IF EXISTS snapshots;"
+            + SCHEMA + SNAPSHOT_SCHEMA
+        )
 
 def ensure_schema():
     """Verify that `restaurants` has the expected columns; rebuild if not."""
     expected = {
         "id", "name", "address", "website", "has_prix_fixe", "label",
         "raw_text", "snippet", "review_link", "types",
-        "location", "rating", "photo_ref",
+        "location", "rating", "photo_ref", "deal_info",
     }
 
     if not os.path.exists(DB_FILE):
@@ -125,6 +162,9 @@ def ensure_schema():
         if cols != expected:
             log.info("Schema drift detected → rebuilding prix_fixe.db")
             init_db()
+        else:
+            with sqlite3.connect(DB_FILE) as c:
+                c.executescript(SNAPSHOT_SCHEMA)
     except sqlite3.DatabaseError:
         init_db()
 
@@ -132,33 +172,65 @@ def store_rows(rows):
     if not rows:
         return
     with sqlite3.connect(DB_FILE) as c:
+        before = c.total_changes
         c.executemany(
             """
             INSERT OR IGNORE INTO restaurants
             (name,address,website,has_prix_fixe,label,raw_text,
-             snippet,review_link,types,location,rating,photo_ref)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+             snippet,review_link,types,location,rating,photo_ref,deal_info)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
             """,
             rows,
         )
+        if c.total_changes != before:
+            locs = {r[9] for r in rows}
+            c.execute(
+                f"DELETE FROM snapshots WHERE location IN ({','.join('?' * len(locs))})",
+                tuple(locs),
+            )
 
 def fetch_records(loc):
     with sqlite3.connect(DB_FILE) as c:
         return c.execute(
             """
             SELECT name,address,website,label,snippet,review_link,
-                   types,rating,photo_ref
+                   types,rating,photo_ref,deal_info
             FROM restaurants
             WHERE has_prix_fixe=1 AND location=?
             """,
             (loc,),
         ).fetchall()
 
-# ─────────────────── Google Sheet helpers ──────────────────
+# ─────────────────── Result snapshots ──────────────────────
+def build_snapshot(loc):
+    """Grouped, display‑ordered card data for `loc`: [[group, [record, …]], …]."""
+    grp = {}
+    for r in fetch_records(loc):
+        grp.setdefault(canonical_group(r[3]), []).append(list(r))
+    return [[g, grp[g]] for g in sorted(grp, key=group_rank)]
+
+def save_snapshot(loc, groups=None):
+    groups = build_snapshot(loc) if groups is None else groups
+    blob = zlib.compress(json.dumps(groups, separators=(",", ":")).encode("utf-8"))
+    with sqlite3.connect(DB_FILE) as c:
+        c.execute(
+            "INSERT OR REPLACE INTO snapshots (location, data, built) VALUES (?,?,?)",
+            (loc, blob, time.time()),
+        )
+    return groups
+
+def load_snapshot(loc):
+    """Materialized card data for `loc`, or None if absent / invalidated."""
+    with sqlite3.connect(DB_FILE) as c:
+        row = c.execute("SELECT data FROM snapshots WHERE location=?", (loc,)).fetchone()
+    return json.loads(zlib.decompress(row[0])) if row else None
+
+# ─────────────────── Google Sheet helpers ──────────────────
 def write_to_sheet(rows):
     if not rows:
         return
     try:
+        sheet = get_sheet()
         existing = sheet.get_all_values()[1:]
         existing_keys = {(r[0], r[1], r[8]) for r in existing}
         for r in rows:
@@ -181,7 +253,7 @@ def write_to_sheet(rows):
 
 def clear_sheet_except_header():
     try:
-        sheet.resize(rows=1)
+        get_sheet().resize(rows=1)
         log.info("Sheet cleared (except header row).")
     except Exception as e:
         log.error(f"Failed to clear sheet: {e}")
@@ -205,7 +277,7 @@ def prioritize(places):
     )
 
 # ─────────────────── Per‑place processor ───────────────────
-def process_place(place, loc):
+def process_place(place, loc, site_cache=None):
     name, addr = place["name"], place["vicinity"]
     web = place.get("website") or place.get("menu_url")
     rating, photo = place.get("rating"), place.get("photo_ref")
@@ -220,14 +292,17 @@ def process_place(place, loc):
             return None
 
     try:
-        text = clean_utf8(fetch_website_text(web, dedupe=True)) if web else ""
-        matched, lbl = detect_prix_fixe_detailed(text)
+        text, matched, lbl = scan_website(web, dedupe=True, cache=site_cache) if web else ("", False, "")
+        text = clean_utf8(text)
         if matched:
-            snippet, link = first_review(pid), review_link(pid)
+            snippet, link = first_review(place), review_link(pid)
             types = ", ".join(nice_types(g_types))
+            deal = deal_summary(
+                extract_menu_details(text, find_prix_fixe_matches(text), web), lbl
+            )
             return (
                 name, addr, web, 1, lbl, text,
-                snippet, link, types, loc, rating, photo,
+                snippet, link, types, loc, rating, photo, deal,
             )
         log.info(f"{name} • skipped (no qualifying phrases found)")
     except Exception as e:
@@ -235,24 +310,23 @@ def process_place(place, loc):
     return None
 
 # ────────────────────── Card builder ───────────────────────
-def build_card(name, addr, web, lbl, snippet, link, types_txt, rating, photo):
+def build_card(name, addr, web, lbl, snippet, link, types_txt, rating, photo, deal=""):
     chips = "".join(
         f'<span class="chip">{t}</span>'
         for t in (types_txt.split(", ") if types_txt else [])
     )
-    photo_tag = (
-        f'<img src="https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photo_reference={photo}&key={GOOGLE_API_KEY}">'
-        if photo else ""
-    )
+    thumb = thumbnail_data_uri(photo) if photo else None
+    photo_tag = f'<img src="{thumb}">' if thumb else ""
     snippet_ht = (
         f'<p class="snippet">💬 {snippet} <a href="{link}" target="_blank">Read&nbsp;more</a></p>'
         if snippet else ""
     )
     rating_ht = f'<div class="rate">{rating:.1f} / 5</div>' if rating else ""
+    deal_ht = f'<div class="deal">{deal}</div>' if deal else ""
     return (
         '<div class="card">' + photo_tag + '<div class="body">'
         f'<span class="badge">{lbl}</span><div class="chips">{chips}</div>'
-        f'<div class="title">{name}</div>{snippet_ht}<div class="addr">{addr}</div>'
+        f'<div class="title">{name}</div>{deal_ht}{snippet_ht}<div class="addr">{addr}</div>'
         f'{rating_ht}<a href="{web}" target="_blank">Visit&nbsp;Site</a></div></div>'
     )
 
@@ -270,6 +344,7 @@ html,body,[data-testid="stAppViewContainer"]{background:#f8f9fa!important;color:
 .snippet{font-size:.83rem;color:#444;margin:.35rem 0 .5rem}.snippet a{color:#0d6efd;text-decoration:none}
 .chips{margin-bottom:4px}.chip{display:inline-block;background:#e1e5ea;color:#111;border-radius:999px;
 padding:2px 8px;font-size:.72rem;margin-right:4px;margin-bottom:4px}
+.deal{font-size:.85rem;font-weight:600;color:#212529;margin:.2rem 0}
 .addr{font-size:.9rem;color:#555;margin-bottom:6px}.rate{font-size:.9rem;color:#f39c12;margin-bottom:8px}
 .badge{display:inline-block;background:#e74c3c;color:#fff;border-radius:4px;
 padding:2px 6px;font-size:.75rem;margin-bottom:6px;margin-right:6px}
@@ -305,72 +380,122 @@ def want_group(g):
     return ("Any deal" in selected_deals) or (g in selected_deals)
 
 # ───────────────────── Search logic ────────────────────────
-def run_search(limit):
-    status, anim = st.empty(), st.empty()
-    status.markdown("### Please wait for The Fixe… *(we’re cooking)*", unsafe_allow_html=True)
-    cook = load_lottie("Animation - 1748132250829.json")
-    if cook:
-        with anim.container():
-            st_lottie(cook, height=260, key=f"cook-{time.time()}")
+def search_job(job, loc, limit):
+    """Background body of a search for `loc`, as the user typed it."""
+    raw = cached_text_search(loc)
 
-    try:
-        raw = cached_text_search(location)
+    sheet_keys = {tuple(r[:3]) for r in get_sheet().get_all_values()[1:]}
+    with sqlite3.connect(DB_FILE) as c:
+        db_keys = set(c.execute("SELECT name,address,location FROM restaurants").fetchall())
+
+    cand = [
+        p for p in raw
+        if (p["name"], p["vicinity"], loc) not in sheet_keys | db_keys
+        and (p.get("website") or p.get("menu_url"))
+    ]
+    cand = prioritize(cand)
+    if limit:
+        cand = cand[:limit]
+
+    site_cache = {}  # one crawl per site for this run only
+    valid = []
+    job.progress(0, len(cand))
+    with ThreadPoolExecutor(max_workers=10) as ex:
+        futures = [ex.submit(process_place, p, loc, site_cache) for p in cand]
+        for i, fut in enumerate(as_completed(futures), 1):
+            row = fut.result()
+            if row:
+                valid.append(row)
+                store_rows([row])
+            job.progress(i, len(cand))
+            if job.cancelled:
+                for f in futures:
+                    f.cancel()
+                break
+    write_to_sheet(valid)
+    if not job.cancelled:
+        save_snapshot(loc)
 
-        sheet_keys = {tuple(r[:3]) for r in sheet.get_all_values()[1:]}
-        with sqlite3.connect(DB_FILE) as c:
-            db_keys = set(c.execute("SELECT name,address,location FROM restaurants").fetchall())
-
-        cand = [
-            p for p in raw
-            if (p["name"], p["vicinity"], location) not in sheet_keys | db_keys
-            and (p.get("website") or p.get("menu_url"))
-        ]
-        cand = prioritize(cand)
-        if limit:
-            cand = cand[:limit]
-
-        with ThreadPoolExecutor(max_workers=10) as ex:
-            rows = list(ex.map(lambda p: process_place(p, location), cand))
-        valid = [r for r in rows if r]
-        store_rows(valid)
-        write_to_sheet(valid)
-    except Exception as e:
-        st.error(f"Search failed: {e}")
+def run_search(limit):
+    loc = location  # jobs.submit normalizes its own dedupe key
+    st.session_state["job_id"] = jobs.submit(
+        loc, limit, lambda job: search_job(job, loc, limit)
+    )
 
-    status.markdown("### The Fixe is in. Scroll below to see the deals.", unsafe_allow_html=True)
-    done = load_lottie("Finished.json")
-    if done:
-        with anim.container():
-            st_lottie(done, height=260, key=f"done-{time.time()}")
+def show_job_status(job_id):
+    """Progress panel for a background search; True while it is still running."""
+    job = jobs.get_job(job_id)
+    if not job:
+        return False
+
+    status, anim = st.empty(), st.empty()
+    if job["status"] in jobs.ACTIVE:
+        status.markdown("### Please wait for The Fixe… *(we’re cooking)*", unsafe_allow_html=True)
+        cook = load_lottie("Animation - 1748132250829.json")
+        if cook:
+            with anim.container():
+                st_lottie(cook, height=260, key=f"cook-{job_id}")
+        if job["total"]:
+            st.progress(job["done"] / job["total"], text=f"{job['done']} / {job['total']} restaurants checked")
+        if not job["cancel"] and st.button("Cancel search"):
+            jobs.cancel(job_id)
+        return True
+
+    if job["status"] == "failed":
+        st.error(f"Search failed: {job['error']}")
+    elif job["status"] == "cancelled":
+        status.markdown("### Search cancelled. Showing what we found so far.", unsafe_allow_html=True)
+    else:
+        status.markdown("### The Fixe is in. Scroll below to see the deals.", unsafe_allow_html=True)
+        done = load_lottie("Finished.json")
+        if done:
+            with anim.container():
+                st_lottie(done, height=260, key=f"done-{job_id}")
+    return False
 
 # ───────────────────── Trigger buttons ─────────────────────
 if st.button("Search"):
     st.session_state.update(searched=True, expanded=False)
-    run_search(limit=25)
+    if not load_snapshot(location):  # town searched before → render snapshot
+        run_search(limit=25)
+
+# re‑attach to a search still running for this town (e.g. after a refresh)
+if "job_id" not in st.session_state and (running := jobs.active_job(location)):
+    st.session_state.update(job_id=running, searched=True)
+
+job_running = False
+if st.session_state.get("job_id"):
+    job_running = show_job_status(st.session_state["job_id"])
+    if not job_running:  # outcome shown once, like the old blocking search
+        st.session_state.pop("job_id")
 
 # ───────────────────── Result render ───────────────────────
 if st.session_state.get("searched"):
-    recs = fetch_records(location)
-    if recs:
-        grp = {}
-        for r in recs:
-            g = canonical_group(r[3])
-            if want_group(g):
-                grp.setdefault(g, []).append(r)
-
-        for g in sorted(grp, key=group_rank):
+    groups = load_snapshot(location)
+    if groups is None:  # no completed search yet (or rows changed since)
+        groups = build_snapshot(location)
+    if groups:
+        prefetch_thumbnails(r[8] for _, recs in groups for r in recs)
+        for g, recs in groups:
+            if not want_group(g):
+                continue
             st.subheader(g)
             cols = st.columns(3)
-            for i, (n, a, w, _, snip, lnk, ty, rating, photo) in enumerate(grp[g]):
+            for i, (n, a, w, _, snip, lnk, ty, rating, photo, deal) in enumerate(recs):
                 with cols[i % 3]:
                     st.markdown(
-                        build_card(n, a, w, g, snip, lnk, ty, rating, photo),
+                        build_card(n, a, w, g, snip, lnk, ty, rating, photo, deal),
                         unsafe_allow_html=True,
                     )
 
-        if (not st.session_state.get("expanded")) and st.button("Expand Search"):
+        if (not st.session_state.get("expanded")) and (not job_running) and st.button("Expand Search"):
             st.session_state["expanded"] = True
             run_search(limit=None)
             safe_rerun()
-    else:
-        st.info("No prix fixe menus stored yet for this location.")
\ No newline at end of file
+    elif not job_running:
+        st.info("No prix fixe menus stored yet for this location.")
+
+# ───────────────────── Job polling ─────────────────────────
+if job_running:
+    time.sleep(1)
+    safe_rerun()
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+import places_api
+from places_api import SweepError, find_restaurants
+
+CENTER = (40.7297, -73.2104)
+LOCATION = f"{CENTER[0]},{CENTER[1]}"
+RADIUS = 20000
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """No disk tile cache, no Details cache and no real sleeping."""
+    monkeypatch.setattr(places_api, "get_cached_tile", lambda key, max_age: None)
+    monkeypatch.setattr(places_api, "set_cached_tile", lambda key, places, saturated: None)
+    monkeypatch.setattr(places_api.time, "sleep", lambda s: None)
+    places_api._details_cache.clear()
+
+
+def _fake_api(monkeypatch, points, nearby_status=None):
+    """
+    Mock `_get_json`: Nearby Search returns up to 60 of `points` inside the
+    query circle; `nearby_status(calls, params)` may return an error status.
+    Details always answers with a website.
+    """
+    calls = []
+
+    def fake(url, params):
+        if url != places_api.NEARBY_URL:
+            return {"result": {"name": params["place_id"], "website": "https://example.com"}}
+        calls.append(params)
+        status = nearby_status(len(calls), params) if nearby_status else None
+        if status:
+            return {"status": status}
+        if "pagetoken" in params:
+            return {"status": "OK", "results": []}
+        lat, lng = map(float, params["location"].split(","))
+        inside = [
+            i for i, (a, b) in enumerate(points)
+            if places_api._distance_m(lat, lng, a, b) <= params["radius"]
+        ]
+        return {
+            "status": "OK",
+            "results": [
+                {"place_id": f"p{i}", "geometry": {"location": {"lat": points[i][0], "lng": points[i][1]}}}
+                for i in inside[:places_api.RESULT_CAP]
+            ],
+        }
+
+    monkeypatch.setattr(places_api, "_get_json", fake)
+    return calls
+
+
+def _points(n, seed=1):
+    rnd = random.Random(seed)
+    return [(CENTER[0] + rnd.gauss(0, 0.05), CENTER[1] + rnd.gauss(0, 0.08)) for _ in range(n)]
+
+
+def _inside(points):
+    return sum(places_api._distance_m(*CENTER, a, b) <= RADIUS for a, b in points)
+
+
+def test_sparse_area_needs_one_tile(monkeypatch):
+    points = _points(10)
+    calls = _fake_api(monkeypatch, points)
+
+    assert len(find_restaurants(LOCATION, RADIUS)) == _inside(points)
+    assert len(calls) == 1
+
+
+def test_saturated_tiles_are_split_until_covered(monkeypatch):
+    points = _points(600)
+    calls = _fake_api(monkeypatch, points)
+
+    assert len(find_restaurants(LOCATION, RADIUS)) == _inside(points)
+    assert len(calls) > 1
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    points = _points(10)
+    calls = _fake_api(
+        monkeypatch, points,
+        lambda n, params: "OVER_QUERY_LIMIT" if n == 1 else "UNKNOWN_ERROR" if n == 2 else None,
+    )
+
+    assert len(find_restaurants(LOCATION, RADIUS)) == _inside(points)
+    assert len(calls) == 3
+
+
+def test_unready_page_token_is_retried(monkeypatch):
+    tokens = iter(["tok"])
+
+    def fake(url, params):
+        if url != places_api.NEARBY_URL:
+            return {"result": {"website": "https://example.com"}}
+        fake.calls += 1
+        if "pagetoken" not in params:
+            return {"status": "OK", "results": [], "next_page_token": next(tokens)}
+        return {"status": "INVALID_REQUEST"} if fake.calls == 2 else {"status": "OK", "results": []}
+
+    fake.calls = 0
+    monkeypatch.setattr(places_api, "_get_json", fake)
+
+    assert find_restaurants(LOCATION, RADIUS) == []
+    assert fake.calls == 3
+
+
+@pytest.mark.parametrize("status", ["REQUEST_DENIED", "INVALID_REQUEST"])
+def test_permanent_errors_abort_without_retry_or_split(monkeypatch, status):
+    calls = _fake_api(monkeypatch, _points(600), lambda n, params: status)
+
+    with pytest.raises(SweepError, match=status):
+        find_restaurants(LOCATION, RADIUS)
+    assert len(calls) == 1
+
+
+def test_exhausted_quota_aborts_after_retries(monkeypatch):
+    calls = _fake_api(monkeypatch, _points(600), lambda n, params: "OVER_QUERY_LIMIT")
+
+    with pytest.raises(SweepError, match="OVER_QUERY_LIMIT"):
+        find_restaurants(LOCATION, RADIUS)
+    assert len(calls) == places_api.REQUEST_RETRIES + 1
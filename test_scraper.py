@@ -0,0 +1,101 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import scraper
+from scraper import _structured_menus, extract_menu_details, find_prix_fixe_matches
+
+
+def _extract(text):
+    return extract_menu_details(text, find_prix_fixe_matches(text), "https://example.com/menu")
+
+
+def test_price_thousands_separator_is_not_a_decimal():
+    assert [r["price"] for r in _extract("prix fixe $1,200")] == [1200.0]
+    assert [r["price"] for r in _extract("prix fixe $1,250.50")] == [1250.5]
+
+
+def test_price_decimal_part():
+    assert [r["price"] for r in _extract("prix fixe $19.95")] == [19.95]
+    assert [r["price"] for r in _extract("prix fixe $19,95")] == [19.95]
+    assert [r["price"] for r in _extract("prix fixe $1200")] == [1200.0]
+
+
+def test_details_come_from_the_hits_own_sentence():
+    text = (
+        "our prix fixe dinner: three courses for $45 per person, "
+        "tuesday - thursday 5pm to 7pm. lunch special mon-fri until 3pm $19.95."
+    )
+    rows = {r["label"]: r for r in _extract(text)}
+
+    assert rows["prix fixe"]["price"] == 45.0
+    assert rows["prix fixe"]["courses"] == 3
+    assert rows["prix fixe"]["days"] == "tuesday - thursday"
+    assert rows["prix fixe"]["times"] == "5pm to 7pm"
+
+    assert rows["lunch special"]["price"] == 19.95
+    assert rows["lunch special"]["courses"] is None
+    assert rows["lunch special"]["days"] == "mon-fri"
+    assert rows["lunch special"]["times"] == "until 3pm"
+
+
+def test_rows_carry_source_url_and_collapse_duplicates():
+    rows = _extract("three course prix fixe $49")
+    assert len(rows) == 1
+    assert rows[0]["menu_url"] == "https://example.com/menu"
+
+
+def test_no_hits_no_rows():
+    assert _extract("burgers and fries") == []
+
+
+def test_has_menu_is_read_from_any_business_type():
+    html = (
+        '<script type="application/ld+json">'
+        '{"@context": "https://schema.org", "@graph": ['
+        '{"@type": "BarOrPub", "hasMenu": "/drinks"},'
+        '{"@type": "LocalBusiness", "menu": {"@type": "Menu", "url": "https://example.com/food.pdf",'
+        ' "name": "Prix Fixe", "hasMenuItem": {"name": "Steak", "offers": {"price": "45"}}}}'
+        ']}</script>'
+    )
+    texts, urls = _structured_menus(BeautifulSoup(html, "html.parser"), "https://example.com/")
+
+    assert urls == ["https://example.com/drinks", "https://example.com/food.pdf"]
+    assert texts == ["prix fixe steak $45"]
+
+
+@pytest.mark.parametrize("decl", ["true", "5", '["/m", 3]', "null", '{"url": 7}'])
+def test_malformed_has_menu_is_ignored(decl):
+    html = f'<script type="application/ld+json">{{"@type": "Restaurant", "hasMenu": {decl}}}</script>'
+    texts, urls = _structured_menus(BeautifulSoup(html, "html.parser"), "https://example.com/")
+
+    assert texts == []
+    assert urls == (["https://example.com/m"] if "/m" in decl else [])
+
+
+def test_sitemap_matches_hosts_with_or_without_www(monkeypatch):
+    sitemap = (
+        b"<urlset><url><loc>https://www.example.com/menu</loc></url>"
+        b"<url><loc>https://example.com/dinner-menu.pdf</loc></url>"
+        b"<url><loc>https://other.com/menu</loc></url></urlset>"
+    )
+    monkeypatch.setattr(scraper, "_stream_get", lambda url, budget: ("text/xml", sitemap, "utf-8"))
+
+    urls = scraper._sitemap_menu_urls("https://example.com/", scraper._ByteBudget(10_000))
+    assert urls == ["https://www.example.com/menu", "https://example.com/dinner-menu.pdf"]
+
+
+def test_scan_website_shares_one_crawl_per_site_and_dedupe_mode(monkeypatch):
+    calls = []
+
+    def fake_scan(url, dedupe):
+        calls.append((url, dedupe))
+        return "excerpt", True, "prix fixe"
+
+    monkeypatch.setattr(scraper, "_scan_pages", fake_scan)
+    cache = {}
+    for url in ["https://www.example.com/", "http://example.com/?utm_source=x", "https://example.com"]:
+        assert scraper.scan_website(url, dedupe=True, cache=cache) == ("excerpt", True, "prix fixe")
+    scraper.scan_website("https://example.com", cache=cache)
+    scraper.scan_website("https://example.com", dedupe=True, cache={})
+
+    assert [d for _, d in calls] == [True, False, True]